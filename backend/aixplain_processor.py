@@ -1,6 +1,7 @@
 import os
 import logging
-from typing import List, Dict
+import threading
+from typing import List, Dict, Iterator
 from dotenv import load_dotenv
 
 import indexing_service
@@ -29,6 +30,17 @@ if AIXPLAIN_SDK_INSTALLED and AIXPLAIN_API_KEY and AIXPLAIN_TEXT_GEN_MODEL_ID:
 else:
     logger.warning("AiXplain SDK/API key/Model ID not found. Using simple fallback for generation.")
 
+def _warm_up_text_generation_model() -> None:
+    """Issues a throwaway generation call so connection setup happens before the first request"""
+    try:
+        text_generation_model.run("hi")
+        logger.info("AiXplain text generation model warmed up.")
+    except Exception as e:
+        logger.warning(f"Text generation model warm-up failed: {e}")
+
+if text_generation_model:
+    threading.Thread(target=_warm_up_text_generation_model, name="text-generation-warmup", daemon=True).start()
+
 def search_vector_store(query: str, max_results: int = 5) -> List[Dict]:
     """Searches for relevant documents using the indexing service"""
     try:
@@ -39,11 +51,10 @@ def search_vector_store(query: str, max_results: int = 5) -> List[Dict]:
         logger.error(f"Vector search error propagated from indexing_service: {e}", exc_info=True)
         return []
 
-def generate_answer_with_aixplain(question: str, search_results: List[Dict]) -> str:
-    """Generates contextual answer using AiXplain LLM or fallback method"""
-    if text_generation_model:
-        if not search_results:
-            prompt = f"""You are 'Policy Navigator', a helpful AI assistant specializing in government policies and regulations.
+def _build_prompt(question: str, search_results: List[Dict]) -> str:
+    """Builds the Policy Navigator prompt for the question and retrieved context"""
+    if not search_results:
+        return f"""You are 'Policy Navigator', a helpful AI assistant specializing in government policies and regulations.
 
 User: "{question}"
 
@@ -53,9 +64,8 @@ Instructions:
 - Be concise and professional
 
 Response:"""
-        else:
-            combined_context = "\n\n---\n\n".join([chunk['text'] for chunk in search_results[:5]])
-            prompt = f"""You are 'Policy Navigator', a helpful AI assistant.
+    combined_context = "\n\n---\n\n".join([chunk['text'] for chunk in search_results[:5]])
+    return f"""You are 'Policy Navigator', a helpful AI assistant.
 Answer the user's question based on the provided context.
 
 Context:
@@ -72,19 +82,63 @@ Instructions:
 - Do NOT respond with greetings
 
 Answer:"""
-        
-        try:
-            generation_result = text_generation_model.run(prompt)
-            if hasattr(generation_result, 'data') and generation_result.data and generation_result.data.strip():
-                return generation_result.data.strip()
-        except Exception as e:
-            logger.error(f"AiXplain generation failed: {e}. Falling back.")
-    
-    # Simple fallback
+
+def _build_fallback_answer(search_results: List[Dict]) -> str:
+    """Builds a simple extractive answer when the LLM is unavailable"""
     if not search_results:
         return "I couldn't find any information about that in my knowledge base."
     
     response = "Based on the information I found:\n\n"
     for chunk in search_results[:3]:
         response += f"From {chunk['source']}: {chunk['text'][:200]}...\n\n"
-    return response
\ No newline at end of file
+    return response
+
+def generate_answer_with_aixplain(question: str, search_results: List[Dict]) -> str:
+    """Generates contextual answer using AiXplain LLM or fallback method"""
+    if text_generation_model:
+        try:
+            generation_result = text_generation_model.run(_build_prompt(question, search_results))
+            if hasattr(generation_result, 'data') and generation_result.data and generation_result.data.strip():
+                return generation_result.data.strip()
+        except Exception as e:
+            logger.error(f"AiXplain generation failed: {e}. Falling back.")
+    
+    return _build_fallback_answer(search_results)
+
+def stream_answer_with_aixplain(question: str, search_results: List[Dict]) -> Iterator[str]:
+    """Yields the answer incrementally when the AiXplain SDK supports streaming"""
+    if not text_generation_model:
+        yield _build_fallback_answer(search_results)
+        return
+
+    prompt = _build_prompt(question, search_results)
+    try:
+        stream = text_generation_model.run(prompt, stream=True)
+    except TypeError:
+        # Older SDK versions do not accept the stream argument
+        yield generate_answer_with_aixplain(question, search_results)
+        return
+    except Exception as e:
+        logger.error(f"AiXplain streaming generation failed to start: {e}. Falling back.")
+        yield _build_fallback_answer(search_results)
+        return
+
+    emitted = False
+    try:
+        if hasattr(stream, '__next__'):
+            for chunk in stream:
+                text = getattr(chunk, 'data', None)
+                if text:
+                    emitted = True
+                    yield text
+        elif hasattr(stream, 'data') and stream.data and stream.data.strip():
+            emitted = True
+            yield stream.data.strip()
+    except Exception as e:
+        if emitted:
+            logger.error(f"AiXplain stream failed after partial output; answer is truncated: {e}", exc_info=True)
+            return
+        logger.error(f"AiXplain streaming generation failed: {e}. Falling back.", exc_info=True)
+
+    if not emitted:
+        yield _build_fallback_answer(search_results)
@@ -1,12 +1,21 @@
 import os
 import json
+import re
+import hashlib
 import logging
-from typing import List, Dict
+import threading
+import time
+import sqlite3
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterable, Iterator
+import numpy as np
 import pandas as pd
-import PyPDF2
+from cachetools import TTLCache
+import pymupdf
 import chromadb
 from chromadb.config import Settings
-from uuid import uuid4
 from dotenv import load_dotenv
 
 try:
@@ -15,6 +24,12 @@ try:
 except ImportError:
     AIXPLAIN_SDK_INSTALLED = False
 
+try:
+    import diskcache
+    DISKCACHE_INSTALLED = True
+except ImportError:
+    DISKCACHE_INSTALLED = False
+
 load_dotenv()
 AIXPLAIN_API_KEY = os.getenv("AIXPLAIN_API_KEY")
 AIXPLAIN_EMBEDDING_MODEL_ID = os.getenv("AIXPLAIN_EMBEDDING_MODEL_ID")
@@ -34,47 +49,237 @@ if AIXPLAIN_SDK_INSTALLED and AIXPLAIN_API_KEY:
 else:
     logger.error("FATAL: AiXplain SDK not installed or API key not found. The application cannot proceed.")
 
-client = chromadb.PersistentClient(path="data/chromadb_data", settings=Settings(anonymized_telemetry=False))
-collection = client.get_or_create_collection(name="policy_documents", metadata={"hnsw:space": "cosine"})
+def _warm_up_embedding_model() -> None:
+    """Issues a throwaway embedding call so connection setup happens before the first request"""
+    try:
+        embedding_model.run(["warmup"])
+        logger.info("AiXplain embedding model warmed up.")
+    except Exception as e:
+        logger.warning(f"Embedding model warm-up failed: {e}")
 
-def embed_texts(texts: List[str]) -> List[List[float]]:
-    """Generates embeddings for text using AiXplain model"""
-    if not texts: return []
-    if not embedding_model:
-        logger.error("Embedding failed: AiXplain model is not available.")
-        return []
-    
+if embedding_model:
+    threading.Thread(target=_warm_up_embedding_model, name="embedding-warmup", daemon=True).start()
+
+CHROMA_DATA_DIRECTORY = os.path.join("data", "chromadb_data")
+COLLECTION_ADD_BATCH_SIZE = 150
+INGEST_MAX_WORKERS = 4
+
+def _enable_sqlite_wal(data_directory: str) -> None:
+    """Switches the Chroma SQLite file to WAL journaling to speed up bulk writes"""
+    database_path = os.path.join(data_directory, "chroma.sqlite3")
+    if not os.path.exists(database_path):
+        return
+    try:
+        # journal_mode is stored in the database file, so it also applies to Chroma's own
+        # connections. Per-connection pragmas (synchronous, temp_store) cannot be set on those
+        # connections from here, so they are not applied at all.
+        with sqlite3.connect(database_path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.Error as e:
+        logger.warning(f"Could not enable WAL journaling on {database_path}: {e}")
+
+client = chromadb.PersistentClient(path=CHROMA_DATA_DIRECTORY, settings=Settings(anonymized_telemetry=False))
+_enable_sqlite_wal(CHROMA_DATA_DIRECTORY)
+COLLECTION_NAME = "policy_documents"
+HNSW_COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 24,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 100,
+    "hnsw:num_threads": os.cpu_count() or 1,
+}
+# Larger HNSW write batches for collections created by a rebuild; sync_threshold must stay above
+# batch_size. Chroma fixes these at creation time, so a rebuilt collection keeps them for every later
+# upload too. Vectors waiting for a batch are still searched through Chroma's brute-force buffer.
+HNSW_REBUILD_METADATA = {**HNSW_COLLECTION_METADATA, "hnsw:batch_size": 500, "hnsw:sync_threshold": 2000}
+
+def _load_document_collection() -> chromadb.Collection:
+    """Opens the document collection, creating it with tuned HNSW parameters if missing"""
+    try:
+        existing = client.get_collection(name=COLLECTION_NAME)
+    except Exception:
+        return client.create_collection(name=COLLECTION_NAME, metadata=HNSW_COLLECTION_METADATA)
+    if (existing.metadata or {}).get("hnsw:M") != HNSW_COLLECTION_METADATA["hnsw:M"]:
+        logger.warning(f"Collection '{COLLECTION_NAME}' uses default HNSW parameters. "
+                       "Call POST /api/rebuild-index to apply the tuned index settings.")
+    return existing
+
+collection = _load_document_collection()
+
+def _load_indexed_sources() -> set:
+    """Collects the source filenames already present in the collection"""
+    return {meta['source'] for meta in collection.get(include=["metadatas"])['metadatas'] if meta and 'source' in meta}
+
+_indexed_sources = _load_indexed_sources()
+_collection_write_lock = threading.Lock()
+query_cache = client.get_or_create_collection(name="query_cache", metadata={"hnsw:space": "cosine"})
+
+EMBED_CACHE_DIRECTORY = os.path.join("data", "embed_cache")
+EMBED_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+EMBED_MEMORY_CACHE_SIZE = 4096
+EMBED_BATCH_SIZE = 96
+EMBED_MAX_WORKERS = 8
+
+EMBED_CACHE_DTYPE = np.float16
+# Bump when the stored embedding format changes so older entries are never decoded
+EMBED_CACHE_FORMAT_VERSION = "v2-unit-fp16"
+
+_embedding_memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+# Shared by every caller, including the concurrent ingest workers, so total API concurrency stays bounded
+_embedding_executor = ThreadPoolExecutor(max_workers=EMBED_MAX_WORKERS, thread_name_prefix="embedding")
+
+embedding_disk_cache = None
+if DISKCACHE_INSTALLED:
+    try:
+        embedding_disk_cache = diskcache.Cache(EMBED_CACHE_DIRECTORY)
+    except Exception as e:
+        logger.warning(f"Persistent embedding cache unavailable, using in-memory cache only: {e}")
+else:
+    logger.warning("diskcache not installed. Embeddings will only be cached in memory.")
+
+def _embedding_cache_key(text: str) -> str:
+    """Builds a content-addressed cache key for text under the configured model"""
+    payload = f"{EMBED_CACHE_FORMAT_VERSION}\0{AIXPLAIN_EMBEDDING_MODEL_ID}\0{text.strip()}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _remember_embedding(key: str, embedding: np.ndarray) -> None:
+    """Stores quantized embedding in the in-memory LRU tier"""
+    with _embedding_cache_lock:
+        _embedding_memory_cache[key] = embedding
+        _embedding_memory_cache.move_to_end(key)
+        while len(_embedding_memory_cache) > EMBED_MEMORY_CACHE_SIZE:
+            _embedding_memory_cache.popitem(last=False)
+
+def _get_cached_embedding(key: str) -> Optional[List[float]]:
+    """Looks up embedding in memory first, then in the persistent cache"""
+    with _embedding_cache_lock:
+        embedding = _embedding_memory_cache.get(key)
+        if embedding is not None:
+            _embedding_memory_cache.move_to_end(key)
+            return embedding.astype(np.float32).tolist()
+    if embedding_disk_cache is None:
+        return None
+    try:
+        payload = embedding_disk_cache.get(key)
+        if payload is None:
+            return None
+        embedding = np.frombuffer(payload, dtype=EMBED_CACHE_DTYPE)
+    except Exception as e:
+        logger.warning(f"Embedding cache read failed, treating as a miss: {e}")
+        return None
+    _remember_embedding(key, embedding)
+    return embedding.astype(np.float32).tolist()
+
+def _cache_embedding(key: str, embedding: np.ndarray) -> None:
+    """Stores quantized embedding in both cache tiers"""
+    _remember_embedding(key, embedding)
+    if embedding_disk_cache is None:
+        return
+    try:
+        embedding_disk_cache.set(key, embedding.tobytes(), expire=EMBED_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Embedding cache write failed: {e}")
+
+def _run_embedding_batch(texts: List[str]) -> Optional[List[List[float]]]:
+    """Embeds a single batch of texts with one AiXplain API call"""
     try:
-        logger.info(f"Embedding {len(texts)} text(s) with AiXplain model...")
         result = embedding_model.run(texts)
         if 'data' in result and result['data']:
             embeddings = [item['embedding'] for item in result['data'] if 'embedding' in item]
             if embeddings and len(embeddings) == len(texts):
-                embedding_dimension = len(embeddings[0])
-                logger.info(f"Successfully extracted {len(embeddings)} embeddings of dimension {embedding_dimension}.")
                 return embeddings
         logger.error("AiXplain API response did not contain valid/complete embedding data.")
         logger.debug(f"Received malformed response: {result}")
     except Exception as e:
         logger.error(f"An exception occurred during AiXplain embedding: {e}", exc_info=True)
+    return None
+
+def _normalize_embeddings(embeddings: List[List[float]]) -> List[List[float]]:
+    """Scales embeddings to unit length so cosine distance reduces to a dot product"""
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).tolist()
+
+def _request_embeddings(texts: List[str]) -> Optional[List[List[float]]]:
+    """Calls the AiXplain embedding model for texts that are not cached"""
+    batches = [texts[start:start + EMBED_BATCH_SIZE] for start in range(0, len(texts), EMBED_BATCH_SIZE)]
+    logger.info(f"Embedding {len(texts)} text(s) with AiXplain model in {len(batches)} batch(es)...")
+    batch_results = list(_embedding_executor.map(_run_embedding_batch, batches))
+
+    if any(batch is None for batch in batch_results):
+        return None
+    embeddings = _normalize_embeddings([embedding for batch in batch_results for embedding in batch])
+    logger.info(f"Successfully extracted {len(embeddings)} embeddings of dimension {len(embeddings[0])}.")
+    return embeddings
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Generates embeddings for text using AiXplain model, reusing cached results"""
+    if not texts: return []
+
+    keys = [_embedding_cache_key(text) for text in texts]
+    embeddings = [_get_cached_embedding(key) for key in keys]
+
+    # Group misses by key so duplicate texts are only sent once
+    pending: Dict[str, List[int]] = {}
+    for index, embedding in enumerate(embeddings):
+        if embedding is None:
+            pending.setdefault(keys[index], []).append(index)
+
+    if not pending:
+        logger.info(f"Served {len(texts)} embedding(s) from cache.")
+        return embeddings
+
+    if not embedding_model:
+        logger.error("Embedding failed: AiXplain model is not available.")
+        return []
+
+    logger.info(f"Embedding cache hits: {len(texts) - sum(len(v) for v in pending.values())}/{len(texts)}.")
+    miss_keys = list(pending)
+    fresh = _request_embeddings([texts[pending[key][0]] for key in miss_keys])
+    if fresh is None:
         return []
 
+    for key, embedding in zip(miss_keys, fresh):
+        # Only the cache tiers are quantized; callers get the full-precision vector on a miss
+        _cache_embedding(key, np.asarray(embedding, dtype=EMBED_CACHE_DTYPE))
+        for index in pending[key]:
+            embeddings[index] = embedding
+    return embeddings
+
 def get_vector_store_collection() -> chromadb.Collection:
     """Returns the ChromaDB collection instance"""
     return collection
 
-def read_pdf(filepath: str) -> str:
-    """Extracts text content from PDF file"""
-    text = ""
+# PyMuPDF does not support multithreading, so every call into it is serialized
+_pdf_lock = threading.Lock()
+
+def iter_pdf_pages(filepath: str) -> Iterator[str]:
+    """Yields the text of each PDF page without loading the whole document text"""
+    try:
+        with _pdf_lock:
+            document = pymupdf.open(filepath)
+            page_count = document.page_count
+    except Exception as e: 
+        logger.error(f"Error reading PDF {filepath}: {e}")
+        return
     try:
-        with open(filepath, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text: text += page_text + "\n"
+        for page_number in range(page_count):
+            # The lock is released between pages so it is never held while the consumer runs
+            with _pdf_lock:
+                page_text = document[page_number].get_text("text")
+            if page_text:
+                yield page_text
     except Exception as e: 
         logger.error(f"Error reading PDF {filepath}: {e}")
-    return text
+    finally:
+        with _pdf_lock:
+            document.close()
+
+def read_pdf(filepath: str) -> str:
+    """Extracts text content from PDF file"""
+    return "\n".join(iter_pdf_pages(filepath))
 
 def read_txt(filepath: str) -> str:
     """Reads content from text file"""
@@ -95,19 +300,24 @@ def read_json(filepath: str) -> str:
         logger.error(f"Error reading JSON {filepath}: {e}")
         return ""
 
+POLICY_SEPARATOR = "===POLICY_SEPARATOR==="
+
+def _csv_column(df: pd.DataFrame, column: str, default: str) -> pd.Series:
+    """Returns a column as strings, filling missing columns or values with default"""
+    if column not in df.columns:
+        return pd.Series(default, index=df.index)
+    return df[column].fillna(default).astype(str)
+
 def read_csv(filepath: str) -> str:
     """Converts CSV policy data to structured text"""
     try:
         df = pd.read_csv(filepath)
-        text_parts = []
-        for _, row in df.iterrows():
-            policy_text = (f"Policy: {row.get('Policy_Name', 'N/A')}\n"
-                           f"Policy ID: {row.get('Policy_ID', 'N/A')}\n"
-                           f"Description: {row.get('Description', 'No description provided.')}\n"
-                           f"Status: {row.get('Status', 'N/A')}\n"
-                           f"Effective Date: {row.get('Effective_Date', 'N/A')}\n")
-            text_parts.append(policy_text)
-        return "\n\n===POLICY_SEPARATOR===\n\n".join(text_parts)
+        policy_texts = ("Policy: " + _csv_column(df, 'Policy_Name', 'N/A') +
+                        "\nPolicy ID: " + _csv_column(df, 'Policy_ID', 'N/A') +
+                        "\nDescription: " + _csv_column(df, 'Description', 'No description provided.') +
+                        "\nStatus: " + _csv_column(df, 'Status', 'N/A') +
+                        "\nEffective Date: " + _csv_column(df, 'Effective_Date', 'N/A') + "\n")
+        return f"\n\n{POLICY_SEPARATOR}\n\n".join(policy_texts.tolist())
     except Exception as e:
         logger.error(f"Error reading CSV {filepath}: {e}")
         return ""
@@ -129,22 +339,50 @@ def read_file(filepath: str) -> str:
         logger.warning(f"Unsupported file type '{extension}' for file: {filepath}")
         return ""
 
-def create_text_chunks(text: str, chunk_size: int = 512, overlap: int = 50) -> List[str]:
+CHUNK_SIZE = 512
+CHUNK_OVERLAP = 50
+
+def iter_pdf_tokens(filepath: str) -> Iterator[str]:
+    """Yields whitespace-separated tokens from a PDF one page at a time"""
+    for page_text in iter_pdf_pages(filepath):
+        yield from page_text.split()
+
+def _window_chunks(tokens: Iterable[str], chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> Iterator[str]:
+    """Yields overlapping chunks from a token stream, holding only one window in memory"""
+    step = chunk_size - overlap
+    token_iterator = iter(tokens)
+    window = list(islice(token_iterator, chunk_size))
+    while window:
+        yield " ".join(window)
+        if len(window) < chunk_size and len(window) <= step:
+            return
+        window = window[step:] + list(islice(token_iterator, step))
+
+def create_text_chunks(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[str]:
     """Splits text into overlapping chunks or by policy separator"""
-    if "===POLICY_SEPARATOR===" in text:
-        return [chunk.strip() for chunk in text.split("===POLICY_SEPARATOR===") if chunk.strip()]
+    if POLICY_SEPARATOR in text:
+        return [chunk.strip() for chunk in text.split(POLICY_SEPARATOR) if chunk.strip()]
     tokens = text.split()
-    if not tokens: 
-        return []
+    return [" ".join(tokens[start:start + chunk_size]) for start in range(0, len(tokens), chunk_size - overlap)]
+
+def read_file_chunks(filepath: str) -> List[str]:
+    """Reads and chunks a file, streaming PDFs page by page instead of building the full text"""
+    if os.path.splitext(filepath)[1].lower() != '.pdf':
+        return create_text_chunks(read_file(filepath))
+    # The chunk list is still materialized for embedding; streaming only avoids holding the
+    # full document string and its token list alongside it
     chunks = []
-    index = 0
-    while index < len(tokens):
-        chunk_text = " ".join(tokens[index:index + chunk_size]).strip()
-        if chunk_text: 
-            chunks.append(chunk_text)
-        index += chunk_size - overlap
+    for chunk in _window_chunks(iter_pdf_tokens(filepath)):
+        if POLICY_SEPARATOR in chunk:
+            # Separator-delimited PDFs keep the section-based chunking of create_text_chunks
+            return create_text_chunks(read_pdf(filepath))
+        chunks.append(chunk)
     return chunks
 
+def _chunk_id(filename: str, chunk_index: int, chunk: str) -> str:
+    """Derives a stable chunk ID so re-indexing a file overwrites instead of duplicating"""
+    return hashlib.blake2b(f"{filename}\0{chunk_index}\0{chunk}".encode("utf-8"), digest_size=16).hexdigest()
+
 def add_document_to_collection(chunks: List[str], filename: str) -> bool:
     """Adds document chunks with embeddings to vector store"""
     if not chunks:
@@ -154,12 +392,43 @@ def add_document_to_collection(chunks: List[str], filename: str) -> bool:
     if embeddings is None or len(embeddings) != len(chunks):
         logger.error(f"Embedding failed for {filename}. Aborting add.")
         return False
-    ids = [str(uuid4()) for _ in chunks]
+    ids = [_chunk_id(filename, i, chunk) for i, chunk in enumerate(chunks)]
     metadatas = [{"source": filename, "chunk_index": i} for i in range(len(chunks))]
-    collection.add(embeddings=embeddings, documents=chunks, metadatas=metadatas, ids=ids)
+    with _collection_write_lock:
+        for start in range(0, len(chunks), COLLECTION_ADD_BATCH_SIZE):
+            end = start + COLLECTION_ADD_BATCH_SIZE
+            collection.upsert(embeddings=embeddings[start:end], documents=chunks[start:end],
+                              metadatas=metadatas[start:end], ids=ids[start:end])
+        _indexed_sources.add(filename)
+    clear_query_cache()
     logger.info(f"Successfully added {len(chunks)} chunks from {filename} to the vector store.")
     return True
 
+def _index_files(data_directory: str, filenames: List[str]) -> List[str]:
+    """Indexes files and returns the ones that succeeded, in input order"""
+    if not filenames:
+        return []
+    # Files are read and chunked on this thread (PyMuPDF is not thread-safe and holds the GIL);
+    # only the I/O-bound embedding and Chroma writes are handed to the pool
+    futures = []
+    with ThreadPoolExecutor(max_workers=min(INGEST_MAX_WORKERS, len(filenames))) as executor:
+        for filename in filenames:
+            logger.info(f"Starting indexing for new file: {filename}")
+            chunks = read_file_chunks(os.path.join(data_directory, filename))
+            if not chunks:
+                logger.warning(f"No text extracted from {filename}. Skipping.")
+                continue
+            futures.append((filename, executor.submit(add_document_to_collection, chunks, filename)))
+
+        indexed = []
+        for filename, future in futures:
+            try:
+                if future.result():
+                    indexed.append(filename)
+            except Exception as e:
+                logger.error(f"Error indexing {filename}: {e}", exc_info=True)
+    return indexed
+
 def build_or_load_vector_store(data_directory: str) -> Dict:
     """Initializes vector store with new documents from directory"""
     metadata = {"indexed_documents": []}
@@ -167,7 +436,7 @@ def build_or_load_vector_store(data_directory: str) -> Dict:
         os.makedirs(data_directory, exist_ok=True)
         return metadata
     
-    existing_documents = {meta['source'] for meta in collection.get(include=["metadatas"])['metadatas']}
+    existing_documents = set(_indexed_sources)
     logger.info(f"Found {len(existing_documents)} already indexed documents.")
     
     # Add ALL existing documents to metadata (THIS IS THE FIX)
@@ -182,58 +451,164 @@ def build_or_load_vector_store(data_directory: str) -> Dict:
         logger.info("No new documents to index.")
         return metadata
     
-    for filename in files_to_index:
-        filepath = os.path.join(data_directory, filename)
-        logger.info(f"Starting indexing for new file: {filename}")
-        text = read_file(filepath)
-        if text:
-            chunks = create_text_chunks(text)
-            if add_document_to_collection(chunks, filename):
-                # Only add if not already in the list (in case of duplicates)
-                if filename not in metadata['indexed_documents']:
-                    metadata['indexed_documents'].append(filename)
-        else:
-            logger.warning(f"No text extracted from {filename}. Skipping.")
+    for filename in _index_files(data_directory, files_to_index):
+        # Only add if not already in the list (in case of duplicates)
+        if filename not in metadata['indexed_documents']:
+            metadata['indexed_documents'].append(filename)
     
     return metadata
 
 def rebuild_vector_store(data_directory: str) -> Dict:
     """Deletes and rebuilds entire vector store from scratch"""
     global collection
-    collection_name = "policy_documents"
-    logger.info(f"Rebuilding vector store. Deleting collection '{collection_name}'...")
+    logger.info(f"Rebuilding vector store. Deleting collection '{COLLECTION_NAME}'...")
     try:
-        client.delete_collection(name=collection_name)
+        client.delete_collection(name=COLLECTION_NAME)
     except Exception: 
         pass
-    collection = client.get_or_create_collection(name=collection_name, metadata={"hnsw:space": "cosine"})
+    collection = client.get_or_create_collection(name=COLLECTION_NAME, metadata=HNSW_REBUILD_METADATA)
+    _indexed_sources.clear()
+    clear_query_cache()
     supported_extensions = {'.csv', '.pdf', '.txt', JSON_EXTENSION}
     files_to_index = [f for f in os.listdir(data_directory) 
                       if os.path.splitext(f)[1].lower() in supported_extensions]
-    metadata = {"indexed_documents": []}
-    for filename in files_to_index:
-        filepath = os.path.join(data_directory, filename)
-        text = read_file(filepath)
-        if text:
-            chunks = create_text_chunks(text)
-            if add_document_to_collection(chunks, filename):
-                metadata['indexed_documents'].append(filename)
+    metadata = {"indexed_documents": _index_files(data_directory, files_to_index)}
     return metadata
 
+MAX_QUERY_RESULTS = 8
+QUERY_CACHE_MAX_DISTANCE = 0.03
+QUERY_CACHE_TTL_SECONDS = 24 * 60 * 60
+QUERY_CACHE_MAX_ENTRIES = 1024
+QUERY_CACHE_PRUNE_INTERVAL_SECONDS = 10 * 60
+
+_exact_query_cache = TTLCache(maxsize=QUERY_CACHE_MAX_ENTRIES, ttl=QUERY_CACHE_TTL_SECONDS)
+_query_cache_lock = threading.Lock()
+_last_query_cache_prune = 0.0
+# Bumped by clear_query_cache so queries that read the collection before a change do not store stale results
+_query_cache_generation = 0
+_QUERY_IDENTIFIER_PATTERN = re.compile(r'[a-z0-9]+(?:[-_./][a-z0-9]+)*')
+
+def _normalize_query(query_text: str) -> str:
+    """Lowercases query and collapses whitespace for exact-match lookups"""
+    return " ".join(query_text.lower().split())
+
+def _query_cache_key(normalized_query: str, max_results: int) -> str:
+    """Builds cache key for a normalized query and result count"""
+    return hashlib.sha256(f"{max_results}\0{normalized_query}".encode("utf-8")).hexdigest()
+
+def _query_identifiers(query_text: str) -> set:
+    """Extracts tokens containing digits (policy IDs, EO, bill or section numbers) from a query"""
+    return {token for token in _QUERY_IDENTIFIER_PATTERN.findall(query_text.lower()) if any(c.isdigit() for c in token)}
+
+def _lookup_exact_query(key: str) -> Optional[List[Dict]]:
+    """Returns cached results for an identical query, if still fresh"""
+    with _query_cache_lock:
+        return _exact_query_cache.get(key)
+
+def _lookup_similar_query(query_text: str, query_embedding: List[List[float]], max_results: int) -> Optional[List[Dict]]:
+    """Returns cached results for a near-duplicate query, if one exists"""
+    try:
+        if query_cache.count() == 0:
+            return None
+        results = query_cache.query(
+            query_embeddings=query_embedding,
+            n_results=1,
+            where={"max_results": max_results},
+            include=["documents", "metadatas", "distances"]
+        )
+        if not results.get('documents') or not results['documents'][0]:
+            return None
+        distance = results['distances'][0][0]
+        cached_at = results['metadatas'][0][0].get('timestamp', 0)
+        cached_query = results['metadatas'][0][0].get('query', '')
+        if distance >= QUERY_CACHE_MAX_DISTANCE or time.time() - cached_at >= QUERY_CACHE_TTL_SECONDS:
+            return None
+        # Near-identical embeddings can still refer to different policies, e.g. POL-001 vs POL-002
+        if _query_identifiers(cached_query) != _query_identifiers(query_text):
+            logger.info(f"Semantic query cache candidate '{cached_query}' rejected: identifiers differ.")
+            return None
+        logger.info(f"Semantic query cache hit for '{cached_query}' (distance {distance:.4f}).")
+        return json.loads(results['documents'][0][0])
+    except Exception as e:
+        logger.warning(f"Semantic query cache lookup failed: {e}")
+    return None
+
+def _prune_query_cache() -> None:
+    """Evicts semantic cache entries older than the TTL, at most once per prune interval"""
+    global _last_query_cache_prune
+    now = time.time()
+    with _query_cache_lock:
+        if now - _last_query_cache_prune < QUERY_CACHE_PRUNE_INTERVAL_SECONDS:
+            return
+        _last_query_cache_prune = now
+    cutoff = now - QUERY_CACHE_TTL_SECONDS
+    try:
+        query_cache.delete(where={"timestamp": {"$lt": cutoff}})
+    except Exception as e:
+        logger.warning(f"Failed to prune semantic query cache: {e}")
+
+def _store_query_results(key: str, query_text: str, query_embedding: List[List[float]], max_results: int,
+                         chunks: List[Dict], generation: int) -> None:
+    """Caches query results for exact and near-duplicate lookups, unless the cache was cleared meanwhile"""
+    now = time.time()
+    # Held across the upsert so clear_query_cache cannot run between the generation check and the write
+    with _query_cache_lock:
+        if generation != _query_cache_generation:
+            logger.info("Document set changed during query; not caching its results.")
+            return
+        _exact_query_cache[key] = chunks
+        try:
+            query_cache.upsert(
+                ids=[key],
+                embeddings=query_embedding,
+                documents=[json.dumps(chunks)],
+                metadatas=[{"query": query_text, "max_results": max_results, "timestamp": now}]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store query in semantic cache: {e}")
+    _prune_query_cache()
+
+def clear_query_cache() -> None:
+    """Drops all cached query results, e.g. after the document set changes"""
+    global _query_cache_generation
+    with _query_cache_lock:
+        _query_cache_generation += 1
+        _exact_query_cache.clear()
+        try:
+            cached_ids = query_cache.get(include=[])['ids']
+            if cached_ids:
+                query_cache.delete(ids=cached_ids)
+        except Exception as e:
+            logger.warning(f"Failed to clear semantic query cache: {e}")
+
 def query_collection(query_text: str, max_results: int = 5) -> List[Dict]:
     """Searches vector store for relevant document chunks"""
-    if collection.count() == 0:
+    cache_generation = _query_cache_generation
+    document_count = collection.count()
+    if document_count == 0:
         logger.warning("Query attempted but the vector store is empty.")
         return []
+    max_results = min(max_results, MAX_QUERY_RESULTS)
+
+    cache_key = _query_cache_key(_normalize_query(query_text), max_results)
+    cached_chunks = _lookup_exact_query(cache_key)
+    if cached_chunks is not None:
+        logger.info("Exact query cache hit.")
+        return cached_chunks
 
     query_embedding = embed_texts([query_text])
-    if query_embedding is None:
+    if not query_embedding:
         logger.error("Failed to embed query text, cannot search.")
         raise ValueError("The embedding service failed to process the query.")
 
+    cached_chunks = _lookup_similar_query(query_text, query_embedding, max_results)
+    if cached_chunks is not None:
+        return cached_chunks
+
     results = collection.query(
         query_embeddings=query_embedding,
-        n_results=min(max_results, collection.count())
+        n_results=min(max_results, document_count),
+        include=["documents", "metadatas", "distances"]
     )
 
     chunks = []
@@ -247,6 +622,7 @@ def query_collection(query_text: str, max_results: int = 5) -> List[Dict]:
                     'distance': distance
                 })
     logger.info(f"Found {len(chunks)} relevant chunks for the query.")
+    _store_query_results(cache_key, query_text, query_embedding, max_results, chunks, cache_generation)
     return chunks
 
 def add_single_file_to_vector_store(filepath: str) -> bool:
@@ -254,21 +630,14 @@ def add_single_file_to_vector_store(filepath: str) -> bool:
     try:
         filename = os.path.basename(filepath)
         
-        existing_documents = {meta['source'] for meta in collection.get(include=["metadatas"])['metadatas']}
-        if filename in existing_documents:
+        if filename in _indexed_sources:
             logger.warning(f"File {filename} is already indexed. Skipping.")
             return False
         
         logger.info(f"Reading file: {filename}")
-        text = read_file(filepath)
-        
-        if not text:
-            logger.error(f"No text extracted from {filename}")
-            return False
-        
-        chunks = create_text_chunks(text)
+        chunks = read_file_chunks(filepath)
         if not chunks:
-            logger.error(f"No chunks created from {filename}")
+            logger.error(f"No text extracted from {filename}")
             return False
         
         logger.info(f"Adding {len(chunks)} chunks from {filename} to vector store")
@@ -1,7 +1,8 @@
 import os
 import re
+import json
 import logging
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 from chromadb.errors import InvalidDimensionException
@@ -19,6 +20,14 @@ UPLOAD_FOLDER = os.path.join('data', 'uploaded_files')
 INITIAL_DOCUMENTS_FOLDER = os.path.join('data', 'initial_files')
 ALLOWED_EXTENSIONS = {'.csv', '.pdf', '.txt', '.json'}
 
+EXECUTIVE_ORDER_QUESTION_PATTERN = re.compile('|'.join([
+    r'\bis (executive order|eo)\s*\d+\b',
+    r'\bstatus of (executive order|eo)\s*\d+\b',
+    r'\bcurrent status.*(executive order|eo)\s*\d+\b',
+    r'\b(has|have) (executive order|eo)\s*\d+ (been )?(repealed|amended)\b',
+]), re.IGNORECASE)
+EXECUTIVE_ORDER_NUMBER_PATTERN = re.compile(r'(executive order|eo)\s*(\d+)', re.IGNORECASE)
+
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(INITIAL_DOCUMENTS_FOLDER, exist_ok=True)
 os.makedirs('tools', exist_ok=True)
@@ -38,13 +47,7 @@ def is_allowed_file(filename):
 
 def is_executive_order_question(question):
     """Detects if question is about executive order status"""
-    patterns = [
-        r'\bis (executive order|eo)\s*\d+\b',
-        r'\bstatus of (executive order|eo)\s*\d+\b',
-        r'\bcurrent status.*(executive order|eo)\s*\d+\b',
-        r'\b(has|have) (executive order|eo)\s*\d+ (been )?(repealed|amended)\b',
-    ]
-    return any(re.search(pattern, question.lower()) for pattern in patterns)
+    return EXECUTIVE_ORDER_QUESTION_PATTERN.search(question) is not None
 
 @app.route('/', methods=['GET'])
 def home():
@@ -55,6 +58,7 @@ def home():
             "GET /api/documents": "List all indexed documents.",
             "POST /api/upload": "Upload a new document.",
             "POST /api/ask": "Ask a question.",
+            "POST /api/ask/stream": "Ask a question and stream the answer as server-sent events.",
             "GET /health": "Health check."
         },
         "indexed_documents_count": len(vector_metadata.get('indexed_documents', [])),
@@ -101,17 +105,10 @@ def upload_file():
         logger.error(f"Unexpected error during file upload: {e}", exc_info=True)
         return jsonify({"error": "Unexpected server error."}), 500
 
-@app.route('/api/ask', methods=['POST'])
-def ask_question():
-    """Processes questions using tools or RAG pipeline"""
-    data = request.get_json()
-    question = data.get('question', '').strip()
-
-    if not question:
-        return jsonify({"error": "No question provided."}), 400
-
+def gather_question_context(question):
+    """Collects context chunks and sources for a question, or a direct answer when no generation is needed"""
     if is_executive_order_question(question):
-        match = re.search(r'(executive order|eo)\s*(\d+)', question, re.IGNORECASE)
+        match = EXECUTIVE_ORDER_NUMBER_PATTERN.search(question)
         if match:
             executive_order_number = match.group(2)
             executive_order_info = get_executive_order_status(executive_order_number)
@@ -123,24 +120,42 @@ def ask_question():
                     f"Date: {executive_order_info['date']}\n"
                     f"Status: {executive_order_info['status']}\n"
                 )
-                generated_answer = aixplain_processor.generate_answer_with_aixplain(
-                    question, [{"text": executive_order_context, "source": "Federal Register API"}]
-                )
-                return jsonify({"answer": generated_answer, "sources": [{"name": f"Federal Register - EO {executive_order_info['number']}", "type": "API"}]})
+                context = [{"text": executive_order_context, "source": "Federal Register API"}]
+                sources = [{"name": f"Federal Register - EO {executive_order_info['number']}", "type": "API"}]
+                return context, sources, None
+
+            return [], [], f"Executive Order {executive_order_number} not found."
+
+    search_results = aixplain_processor.search_vector_store(question)
+
+    # Only include sources if we have search results
+    if search_results:
+        sources = list(dict.fromkeys(chunk['source'] for chunk in search_results))
+        formatted_sources = [{"name": name, "type": "Document"} for name in sources[:3]]
+    else:
+        formatted_sources = []
+
+    return search_results, formatted_sources, None
+
+def format_sse_event(event, payload):
+    """Formats a server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.route('/api/ask', methods=['POST'])
+def ask_question():
+    """Processes questions using tools or RAG pipeline"""
+    data = request.get_json()
+    question = data.get('question', '').strip()
 
-            return jsonify({"answer": f"Executive Order {executive_order_number} not found.", "sources": []})
+    if not question:
+        return jsonify({"error": "No question provided."}), 400
 
     try:
-        search_results = aixplain_processor.search_vector_store(question)
-        answer = aixplain_processor.generate_answer_with_aixplain(question, search_results)
-        
-        # Only include sources if we have search results
-        if search_results:
-            sources = list({chunk['source'] for chunk in search_results})
-            formatted_sources = [{"name": name, "type": "Document"} for name in sources[:3]]
-        else:
-            formatted_sources = []
+        context, formatted_sources, direct_answer = gather_question_context(question)
+        if direct_answer is not None:
+            return jsonify({"answer": direct_answer, "sources": formatted_sources})
 
+        answer = aixplain_processor.generate_answer_with_aixplain(question, context)
         return jsonify({"answer": answer, "sources": formatted_sources})
 
     except ValueError as e:
@@ -150,6 +165,35 @@ def ask_question():
         logger.error(f"Unexpected RAG error: {e}", exc_info=True)
         return jsonify({"error": "Unexpected error processing question."}), 500
 
+@app.route('/api/ask/stream', methods=['POST'])
+def ask_question_stream():
+    """Streams the answer as server-sent events while it is generated"""
+    data = request.get_json()
+    question = data.get('question', '').strip()
+
+    if not question:
+        return jsonify({"error": "No question provided."}), 400
+
+    try:
+        context, formatted_sources, direct_answer = gather_question_context(question)
+    except ValueError as e:
+        logger.error(f"RAG pipeline error: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        logger.error(f"Unexpected RAG error: {e}", exc_info=True)
+        return jsonify({"error": "Unexpected error processing question."}), 500
+
+    def generate_events():
+        yield format_sse_event("sources", formatted_sources)
+        if direct_answer is not None:
+            yield format_sse_event("token", direct_answer)
+        else:
+            for token in aixplain_processor.stream_answer_with_aixplain(question, context):
+                yield format_sse_event("token", token)
+        yield format_sse_event("done", {})
+
+    return Response(stream_with_context(generate_events()), mimetype='text/event-stream')
+
 
 @app.route('/api/rebuild-index', methods=['POST'])
 def rebuild_index():
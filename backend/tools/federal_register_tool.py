@@ -1,19 +1,84 @@
+import os
 import requests
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import diskcache
+    DISKCACHE_INSTALLED = True
+except ImportError:
+    DISKCACHE_INSTALLED = False
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("federal-register-tool")
 
+RESULT_CACHE_TTL_SECONDS = 60 * 60
+RESULT_CACHE_DIRECTORY = os.path.join("data", "fr_cache")
+
+_result_cache = TTLCache(maxsize=1024, ttl=RESULT_CACHE_TTL_SECONDS)
+_result_cache_lock = threading.Lock()
+
+_result_disk_cache = None
+if DISKCACHE_INSTALLED:
+    try:
+        _result_disk_cache = diskcache.Cache(RESULT_CACHE_DIRECTORY)
+    except Exception as e:
+        logger.warning(f"Persistent Federal Register cache unavailable, using in-memory cache only: {e}")
+
+def _get_cached_result(key: str) -> Optional[Dict]:
+    """Looks up a cached API result in memory first, then on disk"""
+    with _result_cache_lock:
+        result = _result_cache.get(key)
+    if result is not None or _result_disk_cache is None:
+        return result
+    try:
+        result = _result_disk_cache.get(key)
+    except Exception as e:
+        logger.warning(f"Federal Register cache read failed: {e}")
+        return None
+    if result is not None:
+        with _result_cache_lock:
+            _result_cache[key] = result
+    return result
+
+def _cache_result(key: str, result: Dict) -> None:
+    """Stores an API result in both cache tiers"""
+    with _result_cache_lock:
+        _result_cache[key] = result
+    if _result_disk_cache is None:
+        return
+    try:
+        _result_disk_cache.set(key, result, expire=RESULT_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Federal Register cache write failed: {e}")
+
+def _create_session() -> requests.Session:
+    """Creates a pooled HTTP session with retries for Federal Register calls"""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retries))
+    return session
+
+_SESSION = _create_session()
+
 def get_federal_register_document(document_number: str) -> Optional[Dict]:
     """Fetches document details from Federal Register API"""
+    cache_key = f"document:{document_number}"
+    cached_document = _get_cached_result(cache_key)
+    if cached_document is not None:
+        return cached_document
     url = f"https://www.federalregister.gov/api/v1/documents/{document_number}.json"
     try:
-        response = requests.get(url, timeout=20)
+        response = _SESSION.get(url, timeout=20)
         response.raise_for_status()
         data = response.json()
-        return {
+        document = {
             "document_number": data.get("document_number"),
             "title": data.get("title"),
             "date": data.get("publication_date"),
@@ -23,6 +88,8 @@ def get_federal_register_document(document_number: str) -> Optional[Dict]:
             "abstract": data.get("abstract"),
             "agencies": [agency.get("name") for agency in data.get("agencies", [])],
         }
+        _cache_result(cache_key, document)
+        return document
     except requests.exceptions.RequestException as e:
         logger.error(f"HTTP error: {e}")
     except Exception as e:
@@ -41,7 +108,7 @@ def search_executive_orders(executive_order_number: str) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=20)
+        response = _SESSION.get(url, params=params, timeout=20)
         response.raise_for_status()
         data = response.json()
         return data.get("results", [])
@@ -53,12 +120,23 @@ def get_executive_order_status(executive_order_number: str) -> Optional[Dict]:
     """Retrieves comprehensive status of executive order including amendments and repeals"""
     try:
         cleaned_number = re.sub(r'\D', '', str(executive_order_number))
+        cache_key = f"eo_status:{cleaned_number}"
+        cached_status = _get_cached_result(cache_key)
+        if cached_status is not None:
+            logger.info(f"Using cached status for Executive Order {cleaned_number}")
+            return cached_status
+        
         logger.info(f"Searching for Executive Order {cleaned_number}")
         
-        search_results = search_executive_orders(cleaned_number)
-        
-        if not search_results:
-            search_results = _perform_general_search(cleaned_number)
+        # Modifications only depend on the EO number, so fetch them alongside the search
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            modifications_future = executor.submit(_check_for_modifications, cleaned_number)
+            search_results = search_executive_orders(cleaned_number)
+            
+            if not search_results:
+                search_results = _perform_general_search(cleaned_number)
+            
+            modifications = modifications_future.result()
         
         if not search_results:
             logger.warning(f"No results found for EO {cleaned_number}")
@@ -76,7 +154,13 @@ def get_executive_order_status(executive_order_number: str) -> Optional[Dict]:
             "repealed": []
         }
         
-        _check_for_modifications(cleaned_number, order_info)
+        if modifications is None:
+            # Status could not be verified, so return it uncached and retry on the next request
+            logger.warning(f"Returning unverified status for EO {cleaned_number}; not caching.")
+            order_info["status"] = "Unknown (amendment/repeal check failed)"
+        else:
+            order_info.update(modifications)
+            _cache_result(cache_key, order_info)
         
         return order_info
         
@@ -93,7 +177,7 @@ def _perform_general_search(executive_order_number: str) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=20)
+        response = _SESSION.get(url, params=params, timeout=20)
         if response.status_code == 200:
             data = response.json()
             return data.get("results", [])
@@ -113,8 +197,9 @@ def _create_not_found_response(executive_order_number: str) -> Dict:
         "repealed": []
     }
 
-def _check_for_modifications(executive_order_number: str, order_info: Dict) -> None:
-    """Searches for amendments or repeals of the executive order"""
+def _check_for_modifications(executive_order_number: str) -> Optional[Dict]:
+    """Searches for amendments or repeals of the executive order, returning None if the lookup fails"""
+    modifications = {"amendments": [], "repealed": []}
     url = "https://www.federalregister.gov/api/v1/documents.json"
     params = {
         "conditions[term]": f'"Executive Order {executive_order_number}" AND (amend OR revoke OR repeal)',
@@ -124,21 +209,25 @@ def _check_for_modifications(executive_order_number: str, order_info: Dict) -> N
     }
     
     try:
-        response = requests.get(url, params=params, timeout=20)
-        if response.status_code == 200:
-            data = response.json()
-            for document in data.get("results", []):
-                document_title = document.get("title", "").lower()
-                modification_info = {
-                    "document": document.get("document_number"),
-                    "title": document.get("title"),
-                    "date": document.get("publication_date")
-                }
-                
-                if "revok" in document_title or "repeal" in document_title:
-                    order_info["status"] = "Repealed"
-                    order_info["repealed"].append(modification_info)
-                elif "amend" in document_title:
-                    order_info["amendments"].append(modification_info)
+        response = _SESSION.get(url, params=params, timeout=20)
+        if response.status_code != 200:
+            logger.error(f"Modification search for EO {executive_order_number} returned HTTP {response.status_code}")
+            return None
+        data = response.json()
+        for document in data.get("results", []):
+            document_title = document.get("title", "").lower()
+            modification_info = {
+                "document": document.get("document_number"),
+                "title": document.get("title"),
+                "date": document.get("publication_date")
+            }
+            
+            if "revok" in document_title or "repeal" in document_title:
+                modifications["status"] = "Repealed"
+                modifications["repealed"].append(modification_info)
+            elif "amend" in document_title:
+                modifications["amendments"].append(modification_info)
     except Exception as e:
-        logger.error(f"Error checking for modifications: {e}")
\ No newline at end of file
+        logger.error(f"Error checking for modifications: {e}")
+        return None
+    return modifications
\ No newline at end of file